@@ -1,10 +1,65 @@
 import streamlit as st
 import re
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import os
 import time
+import sqlite3
 import json
+import functools
+import threading
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import unquote, urlparse
 from typing import List, Dict, Optional
 from dataclasses import dataclass
+from types import MappingProxyType
+
+# Shared read-only defaults for result lookups in the render loop
+_EMPTY_DICT = MappingProxyType({})
+_EMPTY_LIST = ()
+
+# Above this many references the results switch to a single summary table,
+# with detailed cards only for the references that need attention
+_TABLE_VIEW_THRESHOLD = 20
+_STATUS_LABELS = {
+    'valid': '✅ Valid',
+    'structure_error': '🟡 Formatting issue',
+    'content_error': '🟡 Content issue',
+    'likely_fake': '🔴 Likely fake'
+}
+
+# Fixed labels used by every result card
+_TYPE_ICONS = {'journal': '📄', 'book': '📚', 'website': '🌐'}
+_TYPE_NAMES = {'journal': 'Journal', 'book': 'Book', 'website': 'Website'}
+_LBL_VERIFIED_VIA = "**Verified via:**"
+_LBL_ATTEMPTS = "**Verification Attempts:**"
+_REASON_STRUCTURE = "**Reason:** The reference has formatting problems."
+_REASON_CONTENT = "**Reason:** Could not reliably extract key information (like title or authors) to perform an existence check."
+_REASON_NOT_FOUND = "**Reason:** While the format may be correct, this reference could not be found in any academic or public databases."
+
+# Registrant prefix, slash, then a non-empty suffix. Older Wiley (SICI) DOIs contain '<' and '>',
+# so only whitespace and quotes are ruled out in the suffix.
+_DOI_SYNTAX = re.compile(r'^10\.\d{4,9}/[^\s"]+$')
+
+def _clean_doi(doi: str) -> str:
+    # The DOI pattern captures up to the next whitespace, so sentence punctuation after the
+    # DOI comes along with it. A closing bracket is only dropped when it has no partner.
+    while doi and doi[-1] in '.,;)':
+        if doi[-1] == ')' and doi.count('(') >= doi.count(')'):
+            break
+        doi = doi[:-1]
+    return doi
+
+# Ways a DOI is commonly written with a prefix in front of the bare 10.xxxx/... form
+_DOI_PREFIX_PATTERN = re.compile(r'^(?:https?://(?:dx\.)?doi\.org/|doi:\s*)', re.IGNORECASE)
+
+def _normalize_doi(doi: str) -> Optional[str]:
+    # Bare, unescaped form of a DOI, or None if what remains is not DOI-shaped
+    doi = _clean_doi(unquote(_DOI_PREFIX_PATTERN.sub('', doi.strip())))
+    return doi if _DOI_SYNTAX.match(doi) else None
 
 @dataclass
 class Reference:
@@ -18,91 +73,132 @@ class Reference:
     pages: str = None
     doi: str = None
 
+# Pattern sources for each citation style, compiled below
+_APA_PATTERN_SOURCES = {
+    'journal_year_in_parentheses': r'\((\d{4}[a-z]?)\)',
+    'journal_title_after_year': r'\)\.\s*([^.]+)\.',
+    'journal_info': r'([A-Za-z][^,\d]*[A-Za-z]),',
+    'volume_pages': r'(\d+)(?:\((\d+)\))?,?\s*(\d+(?:-\d+)?)', # Corrected escaping for regex
+    'publisher_info': r'([A-Z][^.]*(?:Press|Publishers?|Publications?|Books?|Academic|University|Ltd|Inc|Corp|Kluwer|Elsevier|MIT Press|Human Kinetics)[^.]*)', # Added Human Kinetics
+    'doi_pattern': r'https?://doi\.org/([^\s]+)',
+    'author_pattern': r'^([^()]+?)(?:\s*\(\d{4}\))', # Corrected escaping for regex
+    'isbn_pattern': r'ISBN:?\s*([\d-]+)',
+    'url_pattern': r'(https?://[^\s]+)',
+    'website_access_date': r'(?:Retrieved|Accessed)\s+([^,]+)'
+}
+
+_VANCOUVER_PATTERN_SOURCES = {
+    'starts_with_number': r'^(\d+)\.',
+    'journal_title_section': r'^\d+\.\s*[^.]+\.\s*([^.]+)\.', # Corrected escaping for regex
+    'journal_year': r'([A-Za-z][^.;]+)\s*(\d{4})', # Corrected escaping for regex
+    'author_pattern_vancouver': r'^\d+\.\s*([^.]+)\.', # Corrected escaping for regex
+    'book_publisher': r'([A-Z][^;:]+);\s*(\d{4})', # Corrected escaping for regex
+    'website_url_vancouver': r'Available\s+(?:from|at):\s*(https?://[^\s]+)' # Corrected escaping for regex
+}
+
+# Strong indicators, which also earn an extra boost in detect_reference_type. They are named
+# so the boost does not depend on where they sit in the indicator lists below.
+_JOURNAL_STRONG_PATTERN = re.compile(r'\b(volume|issue|pages|p\.)\b')
+_BOOK_STRONG_PATTERNS = (
+    re.compile(r'\b(edition|ed\.)\b'),
+    re.compile(r'\b(manual|handbook|textbook|guidelines)\b'), # Added guidelines
+    re.compile(r'\b(vol\.|volume|chapter)\b') # Added vol/chapter for books
+)
+
+_TYPE_INDICATOR_SOURCES = {
+    'journal': [
+        r'[,;]\s*\d+(?:\(\d+\))?[,:]\s*\d+(?:-\d+)?',
+        r'Journal|Review|Proceedings|Quarterly|Annual',
+        r'https?://doi\.org/',
+        _JOURNAL_STRONG_PATTERN
+    ],
+    'book': [
+        r'(?:Press|Publishers?|Publications?|Books?|Academic|University|Kluwer|Elsevier|MIT Press|Human Kinetics)', # Added Human Kinetics
+        r'ISBN:?\s*[\d-]+',
+        r'(?:pp?\.|pages?)\s*\d+(?:-\d+)?',
+        *_BOOK_STRONG_PATTERNS
+    ],
+    'website': [
+        r'(?:Retrieved|Accessed)\s+(?:from|on)',
+        r'https?://(?:www\.)?[^/\s]+\.[a-z]{2,}',
+        r'Available\s+(?:from|at)'
+    ]
+}
+
+# Compiled once at import and shared by every parser; the methods below call .search on these directly.
+# re.compile returns an already compiled pattern unchanged, so the strong indicators stay the same objects.
+_APA_PATTERNS = {name: re.compile(pattern) for name, pattern in _APA_PATTERN_SOURCES.items()}
+_VANCOUVER_PATTERNS = {name: re.compile(pattern) for name, pattern in _VANCOUVER_PATTERN_SOURCES.items()}
+_TYPE_INDICATORS = {
+    ref_type: [re.compile(pattern) for pattern in patterns]
+    for ref_type, patterns in _TYPE_INDICATOR_SOURCES.items()
+}
+_BOOK_PUBLISHER_PATTERN = re.compile(r'\b(wolters kluwer|elsevier|mit press|university press|human kinetics)\b')
+_VANCOUVER_YEAR_PATTERN = re.compile(r'(\d{4})')
+_VANCOUVER_JOURNAL_PATTERN = re.compile(r'([A-Za-z][^.;\d]*[A-Za-z])[\s.]*\d{4}')
+
 class ReferenceParser:
     def __init__(self):
-        self.apa_patterns = {
-            'journal_year_in_parentheses': r'\((\d{4}[a-z]?)\)',
-            'journal_title_after_year': r'\)\.\s*([^.]+)\.',
-            'journal_info': r'([A-Za-z][^,\d]*[A-Za-z]),',
-            'volume_pages': r'(\d+)(?:\((\d+)\))?,?\s*(\d+(?:-\d+)?)', # Corrected escaping for regex
-            'publisher_info': r'([A-Z][^.]*(?:Press|Publishers?|Publications?|Books?|Academic|University|Ltd|Inc|Corp|Kluwer|Elsevier|MIT Press|Human Kinetics)[^.]*)', # Added Human Kinetics
-            'doi_pattern': r'https?://doi\.org/([^\s]+)',
-            'author_pattern': r'^([^()]+?)(?:\s*\(\d{4}\))', # Corrected escaping for regex
-            'isbn_pattern': r'ISBN:?\s*([\d-]+)',
-            'url_pattern': r'(https?://[^\s]+)',
-            'website_access_date': r'(?:Retrieved|Accessed)\s+([^,]+)'
-        }
-        
-        self.vancouver_patterns = {
-            'starts_with_number': r'^(\d+)\.',
-            'journal_title_section': r'^\d+\.\s*[^.]+\.\s*([^.]+)\.', # Corrected escaping for regex
-            'journal_year': r'([A-Za-z][^.;]+)\s*(\d{4})', # Corrected escaping for regex
-            'author_pattern_vancouver': r'^\d+\.\s*([^.]+)\.', # Corrected escaping for regex
-            'book_publisher': r'([A-Z][^;:]+);\s*(\d{4})', # Corrected escaping for regex
-            'website_url_vancouver': r'Available\s+(?:from|at):\s*(https?://[^\s]+)' # Corrected escaping for regex
-        }
-        
-        self.type_indicators = {
-            'journal': [
-                r'[,;]\s*\d+(?:\(\d+\))?[,:]\s*\d+(?:-\d+)?',
-                r'Journal|Review|Proceedings|Quarterly|Annual',
-                r'https?://doi\.org/',
-                r'\b(volume|issue|pages|p\.)\b' # Strong journal indicator
-            ],
-            'book': [
-                r'(?:Press|Publishers?|Publications?|Books?|Academic|University|Kluwer|Elsevier|MIT Press|Human Kinetics)', # Added Human Kinetics
-                r'ISBN:?\s*[\d-]+',
-                r'(?:pp?\.|pages?)\s*\d+(?:-\d+)?',
-                r'\b(edition|ed\.)\b', # Strong book indicator
-                r'\b(manual|handbook|textbook|guidelines)\b', # Strong book indicator, added guidelines
-                r'\b(vol\.|volume|chapter)\b' # Added vol/chapter for books
-            ],
-            'website': [
-                r'(?:Retrieved|Accessed)\s+(?:from|on)',
-                r'https?://(?:www\.)?[^/\s]+\.[a-z]{2,}',
-                r'Available\s+(?:from|at)'
-            ]
-        }
+        self.apa_patterns = _APA_PATTERNS
+        self.vancouver_patterns = _VANCOUVER_PATTERNS
+        self.type_indicators = _TYPE_INDICATORS
+        # The boost keywords are the strong indicators, which are also in the indicator lists;
+        # sharing the compiled objects lets detect_reference_type reuse their results
+        self.book_boost_patterns = _BOOK_STRONG_PATTERNS
+        self.journal_boost_pattern = _JOURNAL_STRONG_PATTERN
+        self.book_publisher_pattern = _BOOK_PUBLISHER_PATTERN
+        self.vancouver_year_pattern = _VANCOUVER_YEAR_PATTERN
+        self.vancouver_journal_pattern = _VANCOUVER_JOURNAL_PATTERN
+
+    def _search(self, pattern: re.Pattern, ref_text: str, matches: Dict = None) -> Optional[re.Match]:
+        # Type detection, the structure check and extraction look for many of the same patterns in
+        # the same text. When the caller passes a dict, each pattern is searched once per reference
+        # and its match object is shared by all three.
+        if matches is None:
+            return pattern.search(ref_text)
+        if pattern not in matches:
+            matches[pattern] = pattern.search(ref_text)
+        return matches[pattern]
 
-    def detect_reference_type(self, ref_text: str) -> str:
+    def detect_reference_type(self, ref_text: str, matches: Dict = None) -> str:
         ref_lower = ref_text.lower()
 
         # 1. Highest priority: DOI -> Journal
-        if re.search(self.apa_patterns['doi_pattern'], ref_text):
+        if self._search(self.apa_patterns['doi_pattern'], ref_text, matches):
             return 'journal'
 
         # 2. Next priority: ISBN -> Book
-        if re.search(self.apa_patterns['isbn_pattern'], ref_text):
+        if self._search(self.apa_patterns['isbn_pattern'], ref_text, matches):
             return 'book'
 
         # 3. Strong Website indicator: URL + Access Date/Retrieved phrase
         # This is crucial to avoid misclassifying books/journals with incidental URLs
-        if re.search(self.apa_patterns['url_pattern'], ref_text) and \
-           re.search(self.apa_patterns['website_access_date'], ref_text):
+        if self._search(self.apa_patterns['url_pattern'], ref_text, matches) and \
+           self._search(self.apa_patterns['website_access_date'], ref_text, matches):
             return 'website'
         
         # 4. Fallback to scoring for less clear cases, or if strong indicators are absent
         type_scores = {'journal': 0, 'book': 0, 'website': 0}
+        matched = set()
         
         for ref_type, patterns in self.type_indicators.items():
             for pattern in patterns:
-                if re.search(pattern, ref_lower):
+                if pattern.search(ref_lower):
                     type_scores[ref_type] += 1
+                    matched.add(pattern)
         
         # Boost scores for explicit keywords not covered by direct identifiers
         # These boosts help differentiate when direct identifiers are missing
-        if re.search(r'\b(edition|ed\.)\b', ref_lower) or \
-           re.search(r'\b(manual|handbook|textbook|guidelines)\b', ref_lower) or \
-           re.search(r'\b(vol\.|volume|chapter)\b', ref_lower):
+        if any(pattern in matched for pattern in self.book_boost_patterns):
             type_scores['book'] += 2.0 # Increased boost for very strong book indicators
 
-        if re.search(r'\b(volume|issue|pages|p\.)\b', ref_lower):
+        if self.journal_boost_pattern in matched:
             type_scores['journal'] += 1.5 # Boost journal score
 
         # Check for common publisher names specifically for books if no strong type detected yet
         # Only apply this if not already leaning strongly towards journal/website
         if not (type_scores['journal'] >= 1.5 or type_scores['website'] >= 1.5): # Use score threshold
-            if re.search(r'\b(wolters kluwer|elsevier|mit press|university press|human kinetics)\b', ref_lower): # Added human kinetics
+            if self.book_publisher_pattern.search(ref_lower): # Added human kinetics
                 type_scores['book'] += 1.0 # Add a moderate boost for publishers
 
         # Final decision based on scores, with tie-breaking preference
@@ -123,32 +219,30 @@ class ReferenceParser:
 
     def identify_references(self, text: str) -> List[Reference]:
         lines = text.strip().split('\n')
-        references = []
-        
-        for i, line in enumerate(lines):
-            line = line.strip()
-            if line and len(line) > 30: # Minimum length to consider it a valid reference line
-                ref = Reference(text=line, line_number=i+1)
-                references.append(ref)
         
-        return references
+        # Minimum length to consider it a valid reference line
+        return [
+            Reference(text=line, line_number=i+1)
+            for i, line in enumerate(line.strip() for line in lines)
+            if len(line) > 30
+        ]
 
-    def check_structural_format(self, ref_text: str, format_type: str, ref_type: str = None) -> Dict:
+    def check_structural_format(self, ref_text: str, format_type: str, ref_type: str = None, matches: Dict = None) -> Dict:
         result = {
             'structure_valid': False,
             'structure_issues': [],
-            'reference_type': ref_type or self.detect_reference_type(ref_text)
+            'reference_type': ref_type or self.detect_reference_type(ref_text, matches)
         }
         
         detected_type = result['reference_type']
         
         if format_type == "APA":
-            has_year = bool(re.search(self.apa_patterns['journal_year_in_parentheses'], ref_text))
-            has_title = bool(re.search(self.apa_patterns['journal_title_after_year'], ref_text))
+            has_year = bool(self._search(self.apa_patterns['journal_year_in_parentheses'], ref_text, matches))
+            has_title = bool(self._search(self.apa_patterns['journal_title_after_year'], ref_text, matches))
             
             if detected_type == 'journal':
-                has_journal = bool(re.search(self.apa_patterns['journal_info'], ref_text))
-                has_numbers = bool(re.search(self.apa_patterns['volume_pages'], ref_text))
+                has_journal = bool(self._search(self.apa_patterns['journal_info'], ref_text, matches))
+                has_numbers = bool(self._search(self.apa_patterns['volume_pages'], ref_text, matches))
                 
                 if not has_year:
                     result['structure_issues'].append("Missing year in parentheses")
@@ -162,7 +256,7 @@ class ReferenceParser:
                 result['structure_valid'] = has_year and has_title and (has_journal or has_numbers)
             
             elif detected_type == 'book':
-                has_publisher = bool(re.search(self.apa_patterns['publisher_info'], ref_text))
+                has_publisher = bool(self._search(self.apa_patterns['publisher_info'], ref_text, matches))
                 
                 if not has_year:
                     result['structure_issues'].append("Missing year in parentheses")
@@ -174,8 +268,8 @@ class ReferenceParser:
                 result['structure_valid'] = has_year and has_title and has_publisher
             
             elif detected_type == 'website':
-                has_url = bool(re.search(self.apa_patterns['url_pattern'], ref_text))
-                has_access_info = bool(re.search(self.apa_patterns['website_access_date'], ref_text))
+                has_url = bool(self._search(self.apa_patterns['url_pattern'], ref_text, matches))
+                has_access_info = bool(self._search(self.apa_patterns['website_access_date'], ref_text, matches))
                 
                 if not has_title:
                     result['structure_issues'].append("Missing website title")
@@ -187,8 +281,8 @@ class ReferenceParser:
                 result['structure_valid'] = has_title and has_url # Access info is often optional for basic validity
         
         elif format_type == "Vancouver":
-            starts_with_number = bool(re.search(self.vancouver_patterns['starts_with_number'], ref_text))
-            has_title = bool(re.search(self.vancouver_patterns['journal_title_section'], ref_text))
+            starts_with_number = bool(self._search(self.vancouver_patterns['starts_with_number'], ref_text, matches))
+            has_title = bool(self._search(self.vancouver_patterns['journal_title_section'], ref_text, matches))
             
             if not starts_with_number:
                 result['structure_issues'].append("Should start with number and period")
@@ -196,26 +290,26 @@ class ReferenceParser:
                 result['structure_issues'].append("Missing title section")
             
             if detected_type == 'journal':
-                has_journal_year = bool(re.search(self.vancouver_patterns['journal_year'], ref_text))
+                has_journal_year = bool(self._search(self.vancouver_patterns['journal_year'], ref_text, matches))
                 if not has_journal_year:
                     result['structure_issues'].append("Missing journal and year information")
                 result['structure_valid'] = starts_with_number and has_title and has_journal_year
             
             elif detected_type == 'book':
-                has_publisher = bool(re.search(self.vancouver_patterns['book_publisher'], ref_text))
+                has_publisher = bool(self._search(self.vancouver_patterns['book_publisher'], ref_text, matches))
                 if not has_publisher:
                     result['structure_issues'].append("Missing publisher and year information")
                 result['structure_valid'] = starts_with_number and has_title and has_publisher
             
             elif detected_type == 'website':
-                has_url = bool(re.search(self.vancouver_patterns['website_url_vancouver'], ref_text))
+                has_url = bool(self._search(self.vancouver_patterns['website_url_vancouver'], ref_text, matches))
                 if not has_url:
                     result['structure_issues'].append("Missing 'Available from:' URL")
                 result['structure_valid'] = starts_with_number and has_title and has_url
         
         return result
 
-    def extract_reference_elements(self, ref_text: str, format_type: str, ref_type: str = None) -> Dict:
+    def extract_reference_elements(self, ref_text: str, format_type: str, ref_type: str = None, matches: Dict = None) -> Dict:
         elements = {
             'authors': None,
             'year': None,
@@ -226,76 +320,76 @@ class ReferenceParser:
             'isbn': None,
             'doi': None,
             'access_date': None,
-            'reference_type': ref_type or self.detect_reference_type(ref_text),
+            'reference_type': ref_type or self.detect_reference_type(ref_text, matches),
             'extraction_confidence': 'high'
         }
         
         detected_type = elements['reference_type']
         
         # Extract DOI and ISBN first, as they are strong identifiers
-        doi_match = re.search(self.apa_patterns['doi_pattern'], ref_text)
+        doi_match = self._search(self.apa_patterns['doi_pattern'], ref_text, matches)
         if doi_match:
-            elements['doi'] = doi_match.group(1)
+            elements['doi'] = _clean_doi(doi_match.group(1))
         
-        isbn_match = re.search(self.apa_patterns['isbn_pattern'], ref_text)
+        isbn_match = self._search(self.apa_patterns['isbn_pattern'], ref_text, matches)
         if isbn_match:
             elements['isbn'] = isbn_match.group(1)
 
         # IMPORTANT: Only extract generic URL if the detected type is 'website'.
         # This prevents a book reference from picking up a random URL in its text.
         if detected_type == 'website':
-            url_match = re.search(self.apa_patterns['url_pattern'], ref_text)
+            url_match = self._search(self.apa_patterns['url_pattern'], ref_text, matches)
             if url_match:
                 elements['url'] = url_match.group(1)
         
         if format_type == "APA":
-            year_match = re.search(self.apa_patterns['journal_year_in_parentheses'], ref_text)
+            year_match = self._search(self.apa_patterns['journal_year_in_parentheses'], ref_text, matches)
             if year_match:
                 elements['year'] = year_match.group(1)
             
-            title_match = re.search(self.apa_patterns['journal_title_after_year'], ref_text)
+            title_match = self._search(self.apa_patterns['journal_title_after_year'], ref_text, matches)
             if title_match:
                 elements['title'] = title_match.group(1).strip()
             
-            author_match = re.search(self.apa_patterns['author_pattern'], ref_text)
+            author_match = self._search(self.apa_patterns['author_pattern'], ref_text, matches)
             if author_match:
                 elements['authors'] = author_match.group(1).strip()
             
             if detected_type == 'journal':
-                journal_match = re.search(self.apa_patterns['journal_info'], ref_text)
+                journal_match = self._search(self.apa_patterns['journal_info'], ref_text, matches)
                 if journal_match:
                     elements['journal'] = journal_match.group(1).strip()
             
             elif detected_type == 'book':
-                publisher_match = re.search(self.apa_patterns['publisher_info'], ref_text)
+                publisher_match = self._search(self.apa_patterns['publisher_info'], ref_text, matches)
                 if publisher_match:
                     elements['publisher'] = publisher_match.group(1).strip()
             
             elif detected_type == 'website':
-                access_match = re.search(self.apa_patterns['website_access_date'], ref_text)
+                access_match = self._search(self.apa_patterns['website_access_date'], ref_text, matches)
                 if access_match:
                     elements['access_date'] = access_match.group(1).strip()
         
         elif format_type == "Vancouver":
-            year_match = re.search(r'(\d{4})', ref_text)
+            year_match = self._search(self.vancouver_year_pattern, ref_text, matches)
             if year_match:
                 elements['year'] = year_match.group(1)
             
-            title_match = re.search(self.vancouver_patterns['journal_title_section'], ref_text)
+            title_match = self._search(self.vancouver_patterns['journal_title_section'], ref_text, matches)
             if title_match:
                 elements['title'] = title_match.group(1).strip()
             
-            author_match = re.search(self.vancouver_patterns['author_pattern_vancouver'], ref_text)
+            author_match = self._search(self.vancouver_patterns['author_pattern_vancouver'], ref_text, matches)
             if author_match:
                 elements['authors'] = author_match.group(1).strip()
             
             if detected_type == 'journal':
-                journal_match = re.search(r'([A-Za-z][^.;\d]*[A-Za-z])[\s.]*\d{4}', ref_text)
+                journal_match = self._search(self.vancouver_journal_pattern, ref_text, matches)
                 if journal_match:
                     elements['journal'] = journal_match.group(1).strip()
             
             elif detected_type == 'book':
-                publisher_match = re.search(self.vancouver_patterns['book_publisher'], ref_text)
+                publisher_match = self._search(self.vancouver_patterns['book_publisher'], ref_text, matches)
                 if publisher_match:
                     elements['publisher'] = publisher_match.group(1).strip()
         
@@ -317,22 +411,429 @@ class ReferenceParser:
         
         return elements
 
+# Optional contact address for Crossref's "polite" pool, which grants a higher rate limit
+CROSSREF_MAILTO = os.environ.get('CROSSREF_MAILTO')
+
+# (requests per second, concurrent requests) per host
+HOST_LIMITS = {
+    'api.crossref.org': (10, 3) if CROSSREF_MAILTO else (5, 1),
+    'doi.org': (10, 4),
+    'openlibrary.org': (10, 4),
+    'www.googleapis.com': (10, 4)
+}
+DEFAULT_HOST_LIMIT = (10, 4)
+
+# Hosts whose endpoints used here return JSON
+JSON_API_HOSTS = frozenset({'api.crossref.org', 'openlibrary.org', 'www.googleapis.com'})
+
+# Transient statuses. The JSON APIs and doi.org are asked again; websites are not. Wherever
+# one is still the final answer, the lookup is flagged as an error so it is not cached.
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+RETRY_STATUS_HOSTS = JSON_API_HOSTS | {'doi.org'}
+MAX_STATUS_RETRIES = 2
+MAX_RETRY_WAIT = 10 # seconds; a longer Retry-After is capped rather than stalling the run
+
+def _retry_wait(response: requests.Response, attempt: int) -> float:
+    # Honour a Retry-After given in seconds, otherwise back off exponentially
+    retry_after = (response.headers.get('Retry-After') or '').strip()
+    wait = int(retry_after) if retry_after.isdigit() else 0.3 * 2 ** attempt
+    return min(wait, MAX_RETRY_WAIT)
+
+class TokenBucket:
+    # Allows `rate` acquisitions per second on average, with bursts up to `capacity`
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def set_rate(self, rate: float):
+        with self._lock:
+            self.rate = rate
+            # Never below one token, or a rate under 1/s could never allow a request
+            self.capacity = max(1.0, rate)
+            self._tokens = min(self._tokens, self.capacity)
+
+_RATE_INTERVAL_PATTERN = re.compile(r'^(\d+(?:\.\d+)?)\s*(ms|s|m|h)?$')
+_RATE_INTERVAL_UNITS = {'ms': 0.001, 's': 1, 'm': 60, 'h': 3600}
+
+def _advertised_rate(headers) -> Optional[float]:
+    # Requests per second advertised by X-Rate-Limit-Limit / X-Rate-Limit-Interval (e.g. "50" per "1s")
+    limit = headers.get('X-Rate-Limit-Limit')
+    interval = _RATE_INTERVAL_PATTERN.match((headers.get('X-Rate-Limit-Interval') or '').strip())
+    if not limit or not limit.strip().isdigit() or not interval:
+        return None
+    seconds = float(interval.group(1)) * _RATE_INTERVAL_UNITS[interval.group(2) or 's']
+    if int(limit) <= 0 or seconds <= 0:
+        return None
+    return int(limit) / seconds
+
+class HostRateLimiter:
+    # Applies each host's request rate and concurrency limit, so that parallel
+    # verification stays polite without serialising unrelated hosts
+    def __init__(self, limits: Dict[str, tuple] = None, default_limit: tuple = DEFAULT_HOST_LIMIT):
+        self.limits = HOST_LIMITS if limits is None else limits
+        self.default_limit = default_limit
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def _host_state(self, host: str) -> tuple:
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None:
+                rate, concurrency = self.limits.get(host, self.default_limit)
+                state = (threading.BoundedSemaphore(concurrency), TokenBucket(rate))
+                self._hosts[host] = state
+        return state
+
+    def update_from_headers(self, url: str, headers):
+        # Follow the budget an API host advertises, so the configured rate is only a starting
+        # point. Other sites' headers are ignored; their limits are ours to choose.
+        host = urlparse(url).netloc
+        if host not in JSON_API_HOSTS:
+            return
+        rate = _advertised_rate(headers)
+        if rate is not None:
+            bucket = self._host_state(host)[1]
+            if bucket.rate != rate:
+                bucket.set_rate(rate)
+
+    @contextmanager
+    def slot(self, url: str):
+        semaphore, bucket = self._host_state(urlparse(url).netloc)
+        with semaphore:
+            bucket.acquire()
+            yield
+
+# Lookup results are re-checked after a week, so retracted or newly registered works are picked up
+LOOKUP_TTL = 7 * 86400
+# Website checks go stale much faster, so they are redone after an hour like whole results
+WEBSITE_TTL = 3600
+
+class LookupCache:
+    # Thread-safe LRU of lookup results, keyed by lookup name and arguments.
+    # With a ttl (seconds), entries older than that are treated as missing.
+    def __init__(self, maxsize: int = 4096, ttl: float = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _expired(self, stored: float, max_age: float = None) -> bool:
+        # A caller's max_age can only shorten the cache-wide ttl
+        age = time.time() - stored
+        return (self.ttl is not None and age >= self.ttl) or (max_age is not None and age >= max_age)
+
+    def get(self, key, max_age: float = None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            stored, value = entry
+            if self._expired(stored, max_age):
+                if self._expired(stored):
+                    del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, stored: float = None):
+        with self._lock:
+            self._data[key] = (time.time() if stored is None else stored, value)
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+class PersistentLookupCache(LookupCache):
+    # LookupCache backed by a SQLite file, so identifiers resolved before a restart are not
+    # looked up again. Keys and values are stored as JSON. Expired rows are deleted and the
+    # table is capped at max_rows, dropping the oldest entries first.
+    def __init__(self, path: str, maxsize: int = 4096, ttl: float = LOOKUP_TTL, max_rows: int = 50000):
+        super().__init__(maxsize, ttl)
+        self.max_rows = max_rows
+        self._writes = 0
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute('CREATE TABLE IF NOT EXISTS lookups (key TEXT PRIMARY KEY, value TEXT, stored REAL)')
+        self._db.execute('CREATE INDEX IF NOT EXISTS lookups_stored ON lookups (stored)')
+        with self._lock:
+            self._prune()
+
+    def _prune(self):
+        # Caller holds self._lock
+        self._db.execute('DELETE FROM lookups WHERE stored <= ?', (time.time() - self.ttl,))
+        self._db.execute(
+            'DELETE FROM lookups WHERE key IN (SELECT key FROM lookups ORDER BY stored DESC LIMIT -1 OFFSET ?)',
+            (self.max_rows,)
+        )
+        self._db.commit()
+
+    def get(self, key, max_age: float = None):
+        value = super().get(key, max_age)
+        if value is None:
+            db_key = json.dumps(key)
+            with self._lock:
+                try:
+                    row = self._db.execute('SELECT value, stored FROM lookups WHERE key = ?', (db_key,)).fetchone()
+                    if row and self._expired(row[1], max_age):
+                        if self._expired(row[1]):
+                            self._db.execute('DELETE FROM lookups WHERE key = ?', (db_key,))
+                            self._db.commit()
+                        row = None
+                except sqlite3.Error:
+                    # e.g. locked by another process or a full disk: behave as a memory-only miss
+                    self._rollback()
+                    row = None
+            if row:
+                value = json.loads(row[0])
+                super().set(key, value, row[1]) # Keep the original age so it expires on schedule
+        return value
+
+    def set(self, key, value, stored: float = None):
+        stored = time.time() if stored is None else stored
+        super().set(key, value, stored)
+        with self._lock:
+            try:
+                self._db.execute(
+                    'INSERT OR REPLACE INTO lookups (key, value, stored) VALUES (?, ?, ?)',
+                    (json.dumps(key), json.dumps(value), stored)
+                )
+                self._writes += 1
+                if self._writes % 1000 == 0:
+                    self._prune() # Commits as well
+                else:
+                    self._db.commit()
+            except sqlite3.Error:
+                # The entry is still in the in-memory LRU; only the disk copy is lost
+                self._rollback()
+
+    def _rollback(self):
+        # Caller holds self._lock
+        try:
+            self._db.rollback()
+        except sqlite3.Error:
+            pass
+
+def _default_cache_path() -> str:
+    # A per-user cache directory that only this user can read or write, so nobody else on the
+    # machine can plant entries that would mark made-up DOIs or ISBNs as verified
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    directory = os.path.join(base, 'reference_verifier')
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    os.chmod(directory, 0o700)
+    path = os.path.join(directory, 'lookups.sqlite3')
+    os.close(os.open(path, os.O_RDWR | os.O_CREAT, 0o600))
+    os.chmod(path, 0o600)
+    return path
+
+# Streamlit re-executes this script on every rerun, so caches that should outlive a run are
+# created through st.cache_resource, which hands back the same object every time
+
+@st.cache_resource
+def _lookup_cache() -> LookupCache:
+    # One cache for the whole process, so repeated DOIs, ISBNs and queries are looked up
+    # once across references, reruns and sessions. It is written through to disk so that
+    # it also survives restarts; if the file cannot be opened it stays in memory only.
+    try:
+        return PersistentLookupCache(os.environ.get('REFERENCE_CACHE_PATH') or _default_cache_path())
+    except (sqlite3.Error, OSError):
+        return LookupCache(ttl=LOOKUP_TTL)
+
+def _any_lookup_failed(results: List[Dict]) -> bool:
+    # Results where a lookup timed out or errored are not worth keeping; a retry may succeed
+    return any(
+        lookup.get('error')
+        for result in results
+        for lookup in result['existence_check'].get('search_details', _EMPTY_DICT).values()
+    )
+
+def cached_lookup(method=None, *, key=None, max_age=None):
+    # Serve repeated lookups from the searcher's cache. Results flagged as errors
+    # (timeouts, connection failures) are not stored so they are retried next time.
+    # `key` maps the arguments to what actually identifies the result, so that
+    # equivalent calls (e.g. the same DOI in different case) share one entry.
+    # `max_age` (seconds) shortens the cache's ttl for lookups that go stale sooner.
+    if method is None:
+        return functools.partial(cached_lookup, key=key, max_age=max_age)
+    
+    @functools.wraps(method)
+    def wrapper(self, *args):
+        cache_key = (method.__name__,) + (key(*args) if key else args)
+        result = self.cache.get(cache_key, max_age)
+        if result is None:
+            result = method(self, *args)
+            if not result.get('error'):
+                self.cache.set(cache_key, result)
+        return result
+    return wrapper
+
+# Compiled once for the searchers' query building and candidate scoring
+_PUNCTUATION_PATTERN = re.compile(r'[^\w\s]') # Stripped from author names before splitting into parts
+_AUTHOR_SEPARATOR_PATTERN = re.compile(r'[,&]')
+_SURNAME_SEPARATOR_PATTERN = re.compile(r'and|&|,') # Handle 'and', '&', ',' separators
+_QUERY_WORD_PATTERN = re.compile(r'\b[a-zA-Z]{4,}\b')
+# Deletes everything but digits and hyphens from an ISBN; str.translate avoids a regex pass
+_ISBN_CLEAN_TABLE = str.maketrans('', '', ''.join(chr(c) for c in range(128) if chr(c) not in '0123456789-'))
+
+@functools.lru_cache(maxsize=2048)
+def _target_surnames(target_authors: str) -> tuple:
+    # The same reference's author string is scored against every search result,
+    # so its surnames are parsed once and reused
+    surnames = []
+    for author in _SURNAME_SEPARATOR_PATTERN.split(target_authors):
+        author_clean = _PUNCTUATION_PATTERN.sub('', author).strip()
+        if author_clean:
+            name_parts = author_clean.split()
+            if name_parts:
+                surname = name_parts[-1].lower()
+                if len(surname) > 2: # Ensure it's a meaningful surname
+                    surnames.append(surname)
+    return tuple(surnames)
+
+_TITLE_WORD_PATTERN = re.compile(r'\b[a-zA-Z]{3,}\b')
+
+@functools.lru_cache(maxsize=4096)
+def _title_words(title: str) -> frozenset:
+    # A reference's title (or journal/publisher) is compared against every candidate
+    # a search returns, so its word set is built once rather than per comparison
+    return frozenset(_TITLE_WORD_PATTERN.findall(title.lower()))
+
+_PAGE_TITLE_PATTERN = re.compile(r'<title>(.*?)</title>', re.IGNORECASE | re.DOTALL)
+# Stop reading a page after this many bytes if no </title> has turned up
+_PAGE_HEAD_LIMIT = 65536
+
+def _parse_json(response: requests.Response):
+    # json.loads detects UTF-8/16/32 from the raw bytes itself, which skips building
+    # response.text (and any charset guessing) before parsing
+    return json.loads(response.content)
+
 class DatabaseSearcher:
-    def __init__(self):
+    def __init__(self, cache: LookupCache = None):
+        self.cache = cache if cache is not None else _lookup_cache()
+        self.rate_limiter = HostRateLimiter()
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
+        
+        # Size the keep-alive pool for the verification workers so connections to each host
+        # are reused instead of re-handshaking. The adapter only retries connection and read
+        # failures; error statuses are returned as responses and retried in _request.
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=32,
+            max_retries=Retry(
+                total=3,
+                status=0,
+                backoff_factor=0.3,
+                allowed_methods=["GET", "HEAD"],
+                raise_on_status=False
+            )
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        host = urlparse(url).netloc
+        if host in JSON_API_HOSTS:
+            # Ask the APIs for JSON explicitly. This is not set on the session because doi.org
+            # content-negotiates on Accept, and website checks need the HTML page.
+            headers = {'Accept': 'application/json'}
+            if CROSSREF_MAILTO and host == 'api.crossref.org':
+                # Identify ourselves so Crossref routes the request to its polite pool
+                headers['User-Agent'] = f'Reference_verifier/1.0 (mailto:{CROSSREF_MAILTO})'
+            kwargs['headers'] = {**kwargs.get('headers', {}), **headers}
+        
+        # The session is shared by all verification workers; the limiter keeps per-host load bounded
+        for attempt in range(MAX_STATUS_RETRIES + 1):
+            with self.rate_limiter.slot(url):
+                response = self.session.request(method, url, **kwargs)
+            self.rate_limiter.update_from_headers(url, response.headers)
+            
+            if host not in RETRY_STATUS_HOSTS or response.status_code not in RETRY_STATUSES or attempt == MAX_STATUS_RETRIES:
+                return response
+            # Wait outside the host slot so other workers for this host carry on, and go back
+            # through the token bucket for the next attempt
+            response.close()
+            time.sleep(_retry_wait(response, attempt))
+
+    def prefetch_dois(self, dois: List[str], batch_size: int = 20):
+        # Look up many DOIs with one Crossref filter query per batch instead of one request each.
+        # DOIs Crossref knows about are recorded in the cache; anything else (e.g. DataCite DOIs)
+        # is still resolved individually through doi.org.
+        pending = []
+        for doi in dict.fromkeys(doi.lower() for doi in dois if doi):
+            if ',' not in doi and self.cache.get(('crossref_doi', doi)) is None:
+                pending.append(doi)
+        
+        for start in range(0, len(pending), batch_size):
+            batch = pending[start:start + batch_size]
+            try:
+                response = self._request('GET', "https://api.crossref.org/works", params={
+                    'filter': ",".join(f"doi:{doi}" for doi in batch),
+                    'rows': len(batch),
+                    'select': 'DOI,URL'
+                }, timeout=15)
+                response.raise_for_status()
+                data = _parse_json(response)
+            except Exception:
+                continue # Per-DOI checks will cover this batch
+            
+            for item in data.get('message', {}).get('items', []):
+                if item.get('DOI'):
+                    self.cache.set(('crossref_doi', item['DOI'].lower()), item)
 
+    # DOIs are case-insensitive, and the expected title does not affect the outcome. Keyed on
+    # the normalised form so prefixed, escaped or punctuated spellings share one entry.
+    @cached_lookup(key=lambda doi, expected_title: ((_normalize_doi(doi or '') or doi or '').lower(),))
     def check_doi_and_verify_content(self, doi: str, expected_title: str) -> Dict:
         if not doi:
             return {'valid': False, 'reason': 'No DOI provided'}
         
+        normalized = _normalize_doi(doi)
+        if normalized is None:
+            # Not worth a round trip: doi.org cannot resolve something that is not a DOI
+            return {'valid': False, 'reason': 'Malformed DOI', 'doi_url': f"https://doi.org/{doi}"}
+        doi = normalized
+        url = f"https://doi.org/{doi}"
+        
+        crossref_item = self.cache.get(('crossref_doi', doi.lower()))
+        if crossref_item is not None:
+            # Already confirmed as registered by a batched Crossref lookup
+            return {
+                'valid': True,
+                'doi_url': url,
+                'resolved_url': crossref_item.get('URL', url)
+            }
+        
         try:
-            url = f"https://doi.org/{doi}"
-            response = self.session.head(url, timeout=10, allow_redirects=True)
+            # doi.org answers a registered DOI with a redirect to the publisher. The redirect alone
+            # confirms the DOI, so it is not followed: that saves a second round trip, and many
+            # publisher landing pages reject automated requests outright.
+            response = self._request('HEAD', url, timeout=10, allow_redirects=False)
             
-            if response.status_code != 200:
+            if response.status_code in RETRY_STATUSES:
+                # doi.org is overloaded or rate limiting; that says nothing about the DOI
+                return {
+                    'valid': False,
+                    'reason': f'DOI resolver unavailable (status: {response.status_code})',
+                    'doi_url': url,
+                    'error': True
+                }
+            
+            if response.status_code not in (200, 301, 302, 303, 307, 308):
                 return {
                     'valid': False, 
                     'reason': f'DOI does not resolve (status: {response.status_code})',
@@ -342,16 +843,18 @@ class DatabaseSearcher:
             return {
                 'valid': True,
                 'doi_url': url,
-                'resolved_url': response.url
+                'resolved_url': response.headers.get('Location', url)
             }
             
         except Exception as e:
             return {
                 'valid': False,
                 'reason': f'DOI verification error: {str(e)}',
-                'doi_url': f"https://doi.org/{doi}" if doi else None
+                'doi_url': f"https://doi.org/{doi}" if doi else None,
+                'error': True
             }
 
+    @cached_lookup
     def search_by_exact_title(self, title: str) -> Dict:
         if not title or len(title.strip()) < 10:
             return {'found': False, 'reason': 'Title too short for reliable search'}
@@ -364,18 +867,18 @@ class DatabaseSearcher:
                 'select': 'title,author,DOI,URL'
             }
             
-            response = self.session.get(url, params=params, timeout=15)
+            response = self._request('GET', url, params=params, timeout=15)
             response.raise_for_status()
             
-            data = response.json()
+            data = _parse_json(response)
             
-            if 'message' in data and 'items' in data['message']:
-                items = data['message']['items']
-                
+            items = (data.get('message') or _EMPTY_DICT).get('items')
+            if items is not None:
                 for item in items:
-                    if 'title' in item and item['title']:
-                        item_title = item['title'][0] if isinstance(item['title'], list) else str(item['title'])
-                        similarity = self._calculate_title_similarity(title.lower(), item_title.lower())
+                    raw_title = item.get('title')
+                    if raw_title:
+                        item_title = raw_title[0] if isinstance(raw_title, list) else str(raw_title)
+                        similarity = self._calculate_title_similarity(title, item_title, 0.6)
                         
                         if similarity > 0.6: # Threshold for exact title match
                             source_url = None
@@ -396,22 +899,23 @@ class DatabaseSearcher:
             return {'found': False, 'reason': 'No results from title search'}
             
         except Exception as e:
-            return {'found': False, 'reason': f'Title search error: {str(e)}'}
+            return {'found': False, 'reason': f'Title search error: {str(e)}', 'error': True}
 
+    @cached_lookup
     def search_comprehensive(self, authors: str, title: str, year: str, journal: str) -> Dict:
         try:
             query_parts = []
             
             if title:
                 # Use a few key words from the title for initial broad search
-                title_words = re.findall(r'\b[a-zA-Z]{4,}\b', title)[:4]
+                title_words = _QUERY_WORD_PATTERN.findall(title)[:4]
                 query_parts.extend(title_words)
             
             if authors:
                 # Use surnames for author search
-                author_parts = re.split(r'[,&]', authors)[:2]
+                author_parts = _AUTHOR_SEPARATOR_PATTERN.split(authors)[:2]
                 for author in author_parts:
-                    author_clean = re.sub(r'[^\w\s]', '', author).strip()
+                    author_clean = _PUNCTUATION_PATTERN.sub('', author).strip()
                     if author_clean:
                         surname = author_clean.split()[-1]
                         if len(surname) > 2:
@@ -433,13 +937,13 @@ class DatabaseSearcher:
             if year:
                 params['filter'] = f'from-pub-date:{int(year)-1},until-pub-date:{int(year)+1}' # Allow +/- 1 year
             
-            response = self.session.get(url, params=params, timeout=15)
+            response = self._request('GET', url, params=params, timeout=15)
             response.raise_for_status()
             
-            data = response.json()
+            data = _parse_json(response)
             
-            if 'message' in data and 'items' in data['message']:
-                items = data['message']['items']
+            items = (data.get('message') or _EMPTY_DICT).get('items')
+            if items is not None:
                 best_match = None
                 best_score = 0.0 # Use float for score
                 
@@ -473,14 +977,15 @@ class DatabaseSearcher:
             return {'found': False, 'reason': 'No search results'}
             
         except Exception as e:
-            return {'found': False, 'reason': f'Search error: {str(e)}'}
+            return {'found': False, 'reason': f'Search error: {str(e)}', 'error': True}
 
+    @cached_lookup
     def search_books_isbn(self, isbn: str) -> Dict:
         if not isbn:
             return {'found': False, 'reason': 'No ISBN provided'}
         
         try:
-            isbn_clean = re.sub(r'[^\d-]', '', isbn)
+            isbn_clean = isbn.translate(_ISBN_CLEAN_TABLE)
             
             url = f"https://openlibrary.org/api/books"
             params = {
@@ -489,10 +994,10 @@ class DatabaseSearcher:
                 'jscmd': 'data'
             }
             
-            response = self.session.get(url, params=params, timeout=15)
+            response = self._request('GET', url, params=params, timeout=15)
             response.raise_for_status()
             
-            data = response.json()
+            data = _parse_json(response)
             
             if data:
                 isbn_key = f'ISBN:{isbn_clean}'
@@ -509,20 +1014,21 @@ class DatabaseSearcher:
             return {'found': False, 'reason': 'ISBN not found in Open Library'}
             
         except Exception as e:
-            return {'found': False, 'reason': f'ISBN search error: {str(e)}'}
+            return {'found': False, 'reason': f'ISBN search error: {str(e)}', 'error': True}
 
+    @cached_lookup
     def search_books_comprehensive(self, title: str, authors: str, year: str, publisher: str) -> Dict:
         try:
             query_parts = []
             
             if title:
-                title_words = re.findall(r'\b[a-zA-Z]{3,}\b', title)[:5]
+                title_words = _TITLE_WORD_PATTERN.findall(title)[:5]
                 query_parts.extend(title_words)
             
             if authors:
-                author_parts = re.split(r'[,&]', authors)[:2]
+                author_parts = _AUTHOR_SEPARATOR_PATTERN.split(authors)[:2]
                 for author in author_parts:
-                    author_clean = re.sub(r'[^\w\s]', '', author).strip()
+                    author_clean = _PUNCTUATION_PATTERN.sub('', author).strip()
                     if author_clean:
                         name_parts = author_clean.split()
                         query_parts.extend([part for part in name_parts if len(part) > 2])
@@ -533,17 +1039,20 @@ class DatabaseSearcher:
             url = "https://openlibrary.org/search.json"
             params = {
                 'q': ' '.join(query_parts),
-                'limit': 10 # Increase limit to get more potential matches
+                'limit': 10, # Increase limit to get more potential matches
+                'fields': 'key,title,author_name,first_publish_year,publisher' # Only what the scorer reads
             }
             
-            response = self.session.get(url, params=params, timeout=15)
+            response = self._request('GET', url, params=params, timeout=15)
             response.raise_for_status()
             
-            data = response.json()
+            data = _parse_json(response)
             
+            # Scored up front so an empty result set reports a plain "not found" rather than
+            # failing on an unset score and being reported as a lookup error
+            best_score = 0.0
             if 'docs' in data and data['docs']:
                 best_match = None
-                best_score = 0.0
                 
                 for doc in data['docs']:
                     score = self._calculate_book_match_score(doc, title, authors, year, publisher)
@@ -565,8 +1074,9 @@ class DatabaseSearcher:
             return {'found': False, 'reason': f'No good Open Library search results (best score: {best_score:.2f})'}
             
         except Exception as e:
-            return {'found': False, 'reason': f'Open Library book search error: {str(e)}'}
+            return {'found': False, 'reason': f'Open Library book search error: {str(e)}', 'error': True}
 
+    @cached_lookup
     def search_books_google_books(self, title: str, authors: str, year: str, publisher: str) -> Dict:
         try:
             query_parts = []
@@ -574,7 +1084,8 @@ class DatabaseSearcher:
                 query_parts.append(f"intitle:{title}")
             if authors:
                 # Google Books API supports inauthor
-                author_surnames = [re.sub(r'[^\w\s]', '', a).strip().split()[-1] for a in re.split(r'[,&]', authors) if re.sub(r'[^\w\s]', '', a).strip()]
+                cleaned_authors = (_PUNCTUATION_PATTERN.sub('', a).strip() for a in _AUTHOR_SEPARATOR_PATTERN.split(authors))
+                author_surnames = [a.split()[-1] for a in cleaned_authors if a]
                 if author_surnames:
                     query_parts.append(f"inauthor:{' '.join(author_surnames)}")
             if publisher:
@@ -590,19 +1101,21 @@ class DatabaseSearcher:
             url = "https://www.googleapis.com/books/v1/volumes"
             params = {
                 'q': q,
-                'maxResults': 10 # Fetch more results to find the best match
+                'maxResults': 10, # Fetch more results to find the best match
+                'fields': 'totalItems,items(volumeInfo(title,authors,publishedDate,publisher,infoLink))' # Partial response
             }
 
-            response = self.session.get(url, params=params, timeout=15)
+            response = self._request('GET', url, params=params, timeout=15)
             response.raise_for_status()
 
-            data = response.json()
+            data = _parse_json(response)
 
-            if 'items' in data:
+            best_score = 0.0
+            items = data.get('items')
+            if items is not None:
                 best_match = None
-                best_score = 0.0
 
-                for item in data['items']:
+                for item in items:
                     volume_info = item.get('volumeInfo', {})
                     
                     item_title = volume_info.get('title', '')
@@ -633,9 +1146,10 @@ class DatabaseSearcher:
             return {'found': False, 'reason': f'No good Google Books search results (best score: {best_score:.2f})'}
 
         except Exception as e:
-            return {'found': False, 'reason': f'Google Books search error: {str(e)}'}
+            return {'found': False, 'reason': f'Google Books search error: {str(e)}', 'error': True}
 
 
+    @cached_lookup(max_age=WEBSITE_TTL)
     def check_website_accessibility(self, url: str) -> Dict:
         if not url:
             return {'accessible': False, 'reason': 'No URL provided'}
@@ -644,43 +1158,64 @@ class DatabaseSearcher:
             if not url.startswith(('http://', 'https://')):
                 url = 'https://' + url
             
-            # Use a GET request to potentially retrieve title, but HEAD is faster for just accessibility
-            response = self.session.get(url, timeout=10, allow_redirects=True)
-            
-            if response.status_code == 200:
-                page_title_match = re.search(r'<title>(.*?)</title>', response.text, re.IGNORECASE | re.DOTALL)
-                page_title = page_title_match.group(1).strip() if page_title_match else 'Title not found'
-                
-                return {
-                    'accessible': True,
-                    'status_code': response.status_code,
-                    'final_url': response.url,
-                    'page_title': page_title
-                }
-            else:
-                return {
-                    'accessible': False,
-                    'reason': f'Website not accessible (status: {response.status_code})',
-                    'status_code': response.status_code
-                }
+            # GET rather than HEAD, since the page title is reported and some servers reject HEAD.
+            # The body is streamed and reading stops once the <title> has arrived, so only the
+            # start of the page is downloaded.
+            with self._request('GET', url, timeout=10, allow_redirects=True, stream=True) as response:
+                if response.status_code == 200:
+                    head = b''
+                    for chunk in response.iter_content(chunk_size=8192):
+                        head += chunk
+                        if b'</title>' in head.lower() or len(head) >= _PAGE_HEAD_LIMIT:
+                            break
+                    
+                    page_title_match = _PAGE_TITLE_PATTERN.search(head.decode(response.encoding or 'utf-8', errors='replace'))
+                    page_title = page_title_match.group(1).strip() if page_title_match else 'Title not found'
+                    
+                    return {
+                        'accessible': True,
+                        'status_code': response.status_code,
+                        'final_url': response.url,
+                        'page_title': page_title
+                    }
+                else:
+                    result = {
+                        'accessible': False,
+                        'reason': f'Website not accessible (status: {response.status_code})',
+                        'status_code': response.status_code
+                    }
+                    if response.status_code in RETRY_STATUSES:
+                        result['error'] = True # Likely temporary, so not worth caching
+                    return result
                 
         except Exception as e:
             return {
                 'accessible': False,
-                'reason': f'Website check error: {str(e)}'
+                'reason': f'Website check error: {str(e)}',
+                'error': True
             }
 
-    def _calculate_title_similarity(self, title1: str, title2: str) -> float:
-        words1 = set(re.findall(r'\b[a-zA-Z]{3,}\b', title1.lower()))
-        words2 = set(re.findall(r'\b[a-zA-Z]{3,}\b', title2.lower()))
+    def _calculate_title_similarity(self, title1: str, title2: str, min_similarity: float = 0.0) -> float:
+        # Case-insensitive: _title_words lowercases, so callers pass strings unchanged and the
+        # reference's own title keeps hitting its cache entry. Callers that only compare against
+        # a threshold pass it as min_similarity; pairs that cannot reach it return 0.0 without
+        # computing the overlap
+        words1 = _title_words(title1)
+        words2 = _title_words(title2)
         
         if not words1 or not words2:
             return 0.0
         
-        intersection = words1.intersection(words2)
-        union = words1.union(words2)
+        if words1 == words2:
+            return 1.0
+        
+        # The Jaccard index can never exceed the ratio of the two set sizes
+        if min(len(words1), len(words2)) / max(len(words1), len(words2)) < min_similarity:
+            return 0.0
         
-        return len(intersection) / len(union) if union else 0.0
+        # Jaccard index; the union size follows from the intersection, so no union set is built
+        shared = len(words1 & words2)
+        return shared / (len(words1) + len(words2) - shared)
 
     def _calculate_comprehensive_match_score(self, item: Dict, target_title: str, target_authors: str, target_year: str, target_journal: str) -> float:
         score = 0.0
@@ -700,15 +1235,7 @@ class DatabaseSearcher:
                 if 'family' in author:
                     item_authors.append(author['family'].lower())
             
-            target_surnames = []
-            for author in re.split(r'and|&|,', target_authors): # Handle 'and', '&', ',' separators
-                author_clean = re.sub(r'[^\w\s]', '', author).strip()
-                if author_clean:
-                    name_parts = author_clean.split()
-                    if name_parts:
-                        surname = name_parts[-1].lower()
-                        if len(surname) > 2: # Ensure it's a meaningful surname
-                            target_surnames.append(surname)
+            target_surnames = _target_surnames(target_authors)
             
             if item_authors and target_surnames:
                 common_authors = set(item_authors).intersection(set(target_surnames))
@@ -726,18 +1253,19 @@ class DatabaseSearcher:
             
             if item_year and item_year == target_year:
                 year_match_score = 0.15
-            elif item_year and abs(int(item_year) - int(target_year)) <= 1: # Slight year tolerance
+            elif item_year and item_year.isdigit() and abs(int(item_year) - int(target_year)) <= 1: # Slight year tolerance
                 year_match_score = 0.075 # Half score for +/- 1 year
             score += year_match_score
         
         # Journal matching (10% weight)
         journal_match_score = 0.0
-        if target_journal and 'container-title' in item and item['container-title']:
-            item_journal_titles = [t.lower() for t in (item['container-title'] if isinstance(item['container-title'], list) else [item['container-title']])]
+        container_titles = item.get('container-title') if target_journal else None
+        if container_titles:
+            item_journal_titles = [t.lower() for t in (container_titles if isinstance(container_titles, list) else [container_titles])]
             target_journal_lower = target_journal.lower()
             
             if any(target_journal_lower in ij for ij in item_journal_titles) or \
-               any(self._calculate_title_similarity(target_journal_lower, ij) > 0.7 for ij in item_journal_titles):
+               any(self._calculate_title_similarity(target_journal, ij, 0.7) > 0.7 for ij in item_journal_titles):
                 journal_match_score = 0.10
             score += journal_match_score
 
@@ -768,15 +1296,7 @@ class DatabaseSearcher:
         author_score = 0.0
         if 'author_name' in item and item['author_name'] and target_authors:
             item_authors_lower = [a.lower() for a in item['author_name']]
-            target_surnames = []
-            for author in re.split(r'and|&|,', target_authors):
-                author_clean = re.sub(r'[^\w\s]', '', author).strip()
-                if author_clean:
-                    name_parts = author_clean.split()
-                    if name_parts:
-                        surname = name_parts[-1].lower()
-                        if len(surname) > 2:
-                            target_surnames.append(surname)
+            target_surnames = _target_surnames(target_authors)
             
             if item_authors_lower and target_surnames:
                 # Check for surname presence in item's author names
@@ -819,15 +1339,7 @@ class DatabaseSearcher:
         author_score = 0.0
         if item_authors and target_authors:
             item_authors_lower = [a.lower() for a in item_authors]
-            target_surnames = []
-            for author in re.split(r'and|&|,', target_authors):
-                author_clean = re.sub(r'[^\w\s]', '', author).strip()
-                if author_clean:
-                    name_parts = author_clean.split()
-                    if name_parts:
-                        surname = name_parts[-1].lower()
-                        if len(surname) > 2:
-                            target_surnames.append(surname)
+            target_surnames = _target_surnames(target_authors)
             
             if item_authors_lower and target_surnames:
                 author_match_count = sum(1 for ts in target_surnames if any(ts in ia for ia in item_authors_lower))
@@ -840,7 +1352,7 @@ class DatabaseSearcher:
             item_year = item_published_date[:4] # Take first 4 chars for year
             if item_year == target_year:
                 year_match_score = 0.15
-            elif abs(int(item_year) - int(target_year)) <= 1:
+            elif item_year.isdigit() and abs(int(item_year) - int(target_year)) <= 1:
                 year_match_score = 0.075
             score += year_match_score
 
@@ -848,7 +1360,7 @@ class DatabaseSearcher:
         publisher_match_score = 0.0
         if target_publisher and item_publisher:
             # Use title similarity for publisher as well for flexibility
-            pub_sim = self._calculate_title_similarity(target_publisher, item_publisher)
+            pub_sim = self._calculate_title_similarity(target_publisher, item_publisher, 0.6)
             if pub_sim > 0.6: # A reasonable similarity for publisher names
                 publisher_match_score = 0.05
             score += publisher_match_score
@@ -857,74 +1369,118 @@ class DatabaseSearcher:
 
 
 class ReferenceVerifier:
-    def __init__(self):
+    def __init__(self, max_workers: int = 8):
         self.parser = ReferenceParser()
         self.searcher = DatabaseSearcher()
+        self.max_workers = max_workers
+        # Per-line results keyed by (reference text, format), so repeating a list or editing one
+        # line of it only re-verifies what changed. Kept for an hour, since website checks in
+        # particular can change from one run to the next.
+        self.result_cache = LookupCache(maxsize=1024, ttl=3600)
 
-    def verify_references(self, text: str, format_type: str, progress_callback=None) -> List[Dict]:
+    def verify_references(self, text: str, format_type: str, progress_callback=None, result_callback=None) -> List[Dict]:
         references = self.parser.identify_references(text)
         results = []
         
         total_refs = len(references)
         
-        for i, ref in enumerate(references):
-            if progress_callback:
-                progress_callback(i + 1, total_refs, f"Verifying reference {i + 1}")
-            
-            result = {
-                'reference': ref.text,
-                'line_number': ref.line_number,
-                'structure_status': 'unknown',
-                'content_status': 'unknown',
-                'existence_status': 'unknown',
-                'overall_status': 'unknown',
-                'structure_check': {},
-                'existence_check': {},
-                'extracted_elements': {}
-            }
-            
-            ref_type = self.parser.detect_reference_type(ref.text)
-            
-            # Use check_structural_format for format validity and issues
-            structure_check_result = self.parser.check_structural_format(ref.text, format_type, ref_type)
-            result['format_valid'] = structure_check_result['structure_valid']
-            result['errors'] = structure_check_result['structure_issues'] # Use structural issues as format errors
-            result['reference_type'] = ref_type
+        # Lines verified recently are reused, and a line that appears more than once is
+        # verified once; only the rest go out to the network
+        by_text = {}
+        pending = {}
+        for ref in references:
+            if ref.text in by_text or ref.text in pending:
+                continue
+            cached = self.result_cache.get((ref.text, format_type))
+            if cached is not None:
+                by_text[ref.text] = cached
+            else:
+                pending[ref.text] = ref
+        
+        # Confirm all DOIs in the list with batched Crossref queries before the per-reference checks
+        dois = []
+        for ref in pending.values():
+            doi_match = self.parser.apa_patterns['doi_pattern'].search(ref.text)
+            if doi_match:
+                dois.append(_normalize_doi(doi_match.group(1)))
+        self.searcher.prefetch_dois(dois)
+        
+        # Verification is dominated by network round-trips, so references are checked concurrently.
+        # executor.map yields in input order, and progress is reported from the calling thread.
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            verified = executor.map(lambda ref: self._verify_reference(ref, format_type), pending.values())
+            
+            for i, ref in enumerate(references):
+                result = by_text.get(ref.text)
+                if result is None:
+                    # Pending lines come back in first-occurrence order, so this is the next one
+                    result = by_text[ref.text] = next(verified)
+                    if not _any_lookup_failed([result]):
+                        self.result_cache.set((ref.text, format_type), result)
+                elif result['line_number'] != ref.line_number:
+                    result = dict(result, line_number=ref.line_number)
+                
+                results.append(result)
+                if result_callback:
+                    result_callback(result)
+                if progress_callback:
+                    progress_callback(i + 1, total_refs, f"Verified reference {i + 1}")
+        
+        return results
+
+    def _verify_reference(self, ref: Reference, format_type: str) -> Dict:
+        result = {
+            'reference': ref.text,
+            'line_number': ref.line_number,
+            'structure_status': 'unknown',
+            'content_status': 'unknown',
+            'existence_status': 'unknown',
+            'overall_status': 'unknown',
+            'structure_check': {},
+            'existence_check': {},
+            'extracted_elements': {}
+        }
+        
+        matches = {} # Pattern matches shared by the parser calls below
+        ref_type = self.parser.detect_reference_type(ref.text, matches)
+        
+        # Use check_structural_format for format validity and issues
+        structure_check_result = self.parser.check_structural_format(ref.text, format_type, ref_type, matches)
+        result['format_valid'] = structure_check_result['structure_valid']
+        result['errors'] = structure_check_result['structure_issues'] # Use structural issues as format errors
+        result['reference_type'] = ref_type
+        
+        # Structural Check (Level 1)
+        result['structure_check'] = structure_check_result
+        
+        if structure_check_result['structure_valid']:
+            result['structure_status'] = 'valid'
             
-            # Structural Check (Level 1)
-            result['structure_check'] = structure_check_result
+            # Content Extraction (Level 2)
+            elements = self.parser.extract_reference_elements(ref.text, format_type, ref_type, matches)
+            result['extracted_elements'] = elements
             
-            if structure_check_result['structure_valid']:
-                result['structure_status'] = 'valid'
+            if elements['extraction_confidence'] in ['medium', 'high']:
+                result['content_status'] = 'extracted'
                 
-                # Content Extraction (Level 2)
-                elements = self.parser.extract_reference_elements(ref.text, format_type, ref_type)
-                result['extracted_elements'] = elements
+                # Existence Verification (Level 3)
+                existence_results = self._verify_existence(elements)
+                result['existence_check'] = existence_results
                 
-                if elements['extraction_confidence'] in ['medium', 'high']:
-                    result['content_status'] = 'extracted'
-                    
-                    # Existence Verification (Level 3)
-                    existence_results = self._verify_existence(elements)
-                    result['existence_check'] = existence_results
-                    
-                    if existence_results['any_found']:
-                        result['existence_status'] = 'found'
-                        result['overall_status'] = 'valid'
-                    else:
-                        result['existence_status'] = 'not_found'
-                        result['overall_status'] = 'likely_fake'
+                if existence_results['any_found']:
+                    result['existence_status'] = 'found'
+                    result['overall_status'] = 'valid'
                 else:
-                    result['content_status'] = 'extraction_failed'
-                    result['overall_status'] = 'content_error'
+                    result['existence_status'] = 'not_found'
+                    result['overall_status'] = 'likely_fake'
             else:
-                result['structure_status'] = 'invalid'
-                result['overall_status'] = 'structure_error'
-            
-            results.append(result)
-            time.sleep(0.3) # Small delay to prevent hitting API rate limits too quickly
+                result['content_status'] = 'extraction_failed'
+                result['overall_status'] = 'content_error'
+        else:
+            result['structure_status'] = 'invalid'
+            result['overall_status'] = 'structure_error'
         
-        return results
+        return result
 
     def _verify_existence(self, elements: Dict) -> Dict:
         results = {
@@ -942,6 +1498,11 @@ class ReferenceVerifier:
         
         ref_type = elements.get('reference_type', 'journal')
         
+        # APA years can carry a disambiguation letter ("2015b"); the searches and scorers
+        # compare and do arithmetic on the four digits, so strip it once here rather than
+        # letting int() fail and abort the whole search
+        year = (elements.get('year') or '')[:4]
+        
         # --- Priority 1: Direct Identifiers (DOI, ISBN) ---
         # DOI check (common for journals, sometimes present elsewhere)
         if elements.get('doi'):
@@ -982,7 +1543,7 @@ class ReferenceVerifier:
             comprehensive_result = self.searcher.search_comprehensive(
                 elements.get('authors', ''),
                 elements.get('title', ''),
-                elements.get('year', ''),
+                year,
                 elements.get('journal', '')
             )
             results['search_details']['comprehensive_journal'] = comprehensive_result
@@ -1003,7 +1564,7 @@ class ReferenceVerifier:
             book_result_ol = self.searcher.search_books_comprehensive(
                 elements.get('title', ''),
                 elements.get('authors', ''),
-                elements.get('year', ''),
+                year,
                 elements.get('publisher', '')
             )
             results['search_details']['comprehensive_book_openlibrary'] = book_result_ol
@@ -1023,7 +1584,7 @@ class ReferenceVerifier:
                 book_result_gb = self.searcher.search_books_google_books(
                     elements.get('title', ''),
                     elements.get('authors', ''),
-                    elements.get('year', ''),
+                    year,
                     elements.get('publisher', '')
                 )
                 results['search_details']['comprehensive_book_googlebooks'] = book_result_gb
@@ -1057,6 +1618,188 @@ class ReferenceVerifier:
         
         return results
 
+@st.cache_resource
+def get_verifier() -> ReferenceVerifier:
+    # The verifier holds no per-run state, so one instance (and its pooled HTTP session)
+    # serves every click and every session
+    return ReferenceVerifier()
+
+# Verified straight away by the "Load Sample Data" button
+SAMPLE_REFERENCES = """American College of Sports Medicine. (2022). ACSM’s guidelines for exercise testing and prescription (11th ed.). Wolters Kluwer.
+American Heart Association. (2024). Understanding blood pressure readings. American Heart Association. https://www.heart.org/en/health-topics/high-blood-pressure/understanding-blood-pressure-readings
+Australian Government Department of Health and Aged Care. (2021, July 29). Body Mass Index (BMI) and Waist Measurement. Department of Health and Aged Care. https://www.health.gov.au/topics/overweight-and-obesity/bmi-and-waist
+Coombes, J., & Skinner, T. (2014). ESSA’s student manual for health, exercise and sport assessment. Elsevier.
+Health Direct. (2019). Resting heart rate. Healthdirect.gov.au; Healthdirect Australia. https://www.healthdirect.gov.au/resting-heart-rate
+Kumar, K. (2022, January 12). What Is a Good Resting Heart Rate by Age? MedicineNet. https://www.medicinenet.com/what_is_a_good_resting_heart_rate_by_age/article.htm
+Haff, G. G., & Triplett, N. T. (2016). Essentials of strength training and conditioning (4th ed.). Human Kinetics.
+Powden, C. J., Hoch, J. M., & Hoch, M. C. (2015b). Reliability and Minimal Detectable Change of the weight-bearing Lunge test: a Systematic Review. Manual Therapy, 20(4), 524–532. https://doi.org/10.1016/j.math.2015.01.004
+Ryan, C., Uthoff, A., McKenzie, C., & Cronin, J. (2022). Traditional and modified 5-0-5 change of direction test: Normative and reliability analysis. Strength & Conditioning Journal, 44(4), 22–37. https://doi.org/10.1519/SSC.0000000000000635
+Shrestha, M. (2022). Sit and Reach Test. Physiopedia. https://www.physio-pedia.com/Sit_and_Reach_Test
+Watson, S., & Nall, R. (2023, February 2). What Is the Waist-to-Hip Ratio? Healthline; Healthline Media. https://www.healthline.com/health/waist-to-hip-ratio
+Wood, R. (2008). Push Up Test: Home fitness tests. Topendsports.com. https://www.topendsports.com/testing/tests/home-pushup.htm"""
+
+# Static help text for the "How the Traffic Light System Works" expander
+TRAFFIC_LIGHT_EXPLAINER = """
+The verifier uses a three-level process to assign a status to each reference:
+
+#### ✅ Green: Verified and Valid
+- **Structure**: Correctly formatted.
+- **Content**: Key details were extracted successfully.
+- **Existence**: The reference was found and verified in an external database (e.g., Crossref, Open Library, or a live website).
+
+#### 🟡 Yellow: Potential Issues
+- This status means the reference needs manual review. It can be caused by:
+  - **Formatting Errors**: The reference doesn't follow the selected style (APA/Vancouver) rules, such as missing a year or publisher.
+  - **Content Extraction Failure**: The reference is too malformed to reliably identify its parts (title, authors, etc.), preventing an existence check.
+
+#### 🔴 Red: Likely Fake or Erroneous
+- **Structure**: The reference may look perfectly formatted.
+- **Content**: Key details were extracted.
+- **Existence**: **Failed.** The verifier searched all relevant databases (using DOI, ISBN, title, authors, etc.) but could not find any evidence that this publication exists. This indicates the reference may be fabricated or contain critical errors.
+"""
+
+# Display name of a reference type; the known types come from a fixed table
+def _type_name(ref_type: str) -> str:
+    return _TYPE_NAMES.get(ref_type) or ref_type.title()
+
+# Joins a list of strings into one markdown bullet list so a whole section
+# is sent as a single element instead of one element per item
+def _bullets(items, header: str = None) -> str:
+    head = header + "\n\n" if header else ""
+    return head + "\n".join("- " + item for item in items)
+
+# Draws one result card: a coloured status banner followed by a single markdown body.
+# Used both while results stream in and for the final list.
+def _render_result(result: Dict):
+    ref_text = result['reference']
+    status = result['overall_status']
+    ref_type = result.get('reference_type', 'journal')
+    existence = result.get('existence_check') or _EMPTY_DICT
+
+    # Result dicts are shared through the caches, so the renderer only reads from them
+    type_label = f"_{_TYPE_ICONS.get(ref_type, '📄')} {_type_name(ref_type)}_"
+
+    # Everything below the banner goes out as one markdown element per card
+    parts = [type_label, ref_text]
+
+    # --- GREEN LIGHT ---
+    if status == 'valid':
+        with st.container():
+            st.success(f"✅ **Reference {result['line_number']}**: Verified and Valid")
+
+            verification_sources = existence.get('verification_sources') or _EMPTY_LIST
+
+            if verification_sources:
+                parts.append(_bullets(
+                    (f"**{source['type']}**: [{source['description']}]({source['url']})" for source in verification_sources),
+                    _LBL_VERIFIED_VIA
+                ))
+            st.markdown("\n\n".join(parts))
+
+    # --- YELLOW LIGHT ---
+    elif status in ['structure_error', 'content_error']:
+        with st.container():
+            st.warning(f"🟡 **Reference {result['line_number']}**: Potential Formatting or Content Issue")
+
+            if status == 'structure_error':
+                issues = (result.get('structure_check') or _EMPTY_DICT).get('structure_issues') or _EMPTY_LIST
+                parts.append(_REASON_STRUCTURE)
+                if issues:
+                    parts.append(_bullets(issues))
+            elif status == 'content_error':
+                parts.append(_REASON_CONTENT)
+            st.markdown("\n\n".join(parts))
+
+    # --- RED LIGHT ---
+    elif status == 'likely_fake':
+        with st.container():
+            st.error(f"🔴 **Reference {result['line_number']}**: Likely Fake or Erroneous")
+
+            search_details = existence.get('search_details') or _EMPTY_DICT
+
+            parts.append(_REASON_NOT_FOUND)
+            attempts = []
+            if ref_type == 'journal':
+                doi_check = search_details.get('doi')
+                journal_search = search_details.get('comprehensive_journal')
+                if doi_check and not doi_check.get('valid'):
+                    attempts.append(f"**DOI Check**: {doi_check.get('reason')}")
+                if journal_search and not journal_search.get('found'):
+                    attempts.append(f"**Database Search**: {journal_search.get('reason')}")
+
+            elif ref_type == 'book':
+                isbn_search = search_details.get('isbn_search')
+                ol_search = search_details.get('comprehensive_book_openlibrary')
+                gb_search = search_details.get('comprehensive_book_googlebooks')
+                if isbn_search and not isbn_search.get('found'):
+                    attempts.append(f"**ISBN Check**: {isbn_search.get('reason')}")
+                if ol_search and not ol_search.get('found'):
+                    attempts.append(f"**Open Library Search**: {ol_search.get('reason')}")
+                if gb_search and not gb_search.get('found'):
+                    attempts.append(f"**Google Books Search**: {gb_search.get('reason')}")
+
+            elif ref_type == 'website':
+                website_check = search_details.get('website_check')
+                if website_check and not website_check.get('accessible'):
+                    attempts.append(f"**URL Check**: {website_check.get('reason')}")
+
+            # Skip the section header entirely when no lookups were attempted
+            if attempts:
+                parts.append(_bullets(attempts, _LBL_ATTEMPTS))
+            st.markdown("\n\n".join(parts))
+
+# Summary metrics followed by the table and/or result cards for a finished run
+def _render_results(results: List[Dict]):
+    if results:
+        total_refs = len(results)
+        # Tally every status in one pass over the results
+        status_counts = Counter(r['overall_status'] for r in results)
+        valid_refs = status_counts['valid']
+        potential_issues = status_counts['structure_error'] + status_counts['content_error']
+        likely_fake = status_counts['likely_fake']
+
+        # --- MODIFIED: Summary Metrics ---
+        col_a, col_b, col_c, col_d = st.columns(4)
+        with col_a:
+            st.metric("Total References", total_refs)
+        with col_b:
+            st.metric("✅ Valid", valid_refs)
+        with col_c:
+            st.metric("🟡 Potential Issues", potential_issues)
+        with col_d:
+            st.metric("🔴 Likely Fake", likely_fake)
+
+        st.markdown("---")
+
+        detail_results = results
+        if total_refs > _TABLE_VIEW_THRESHOLD:
+            # One table for the whole list instead of a card per reference
+            summary_rows = [{
+                'Line': r['line_number'],
+                'Type': _type_name(r.get('reference_type', 'journal')),
+                'Status': _STATUS_LABELS.get(r['overall_status'], r['overall_status']),
+                'Reference': r['reference'][:80],
+                'Verified via': ", ".join(
+                    source['type'] for source in
+                    (r.get('existence_check') or _EMPTY_DICT).get('verification_sources') or _EMPTY_LIST
+                )
+            } for r in results]
+            st.dataframe(summary_rows, use_container_width=True, hide_index=True)
+
+            detail_results = [r for r in results if r['overall_status'] != 'valid']
+            if detail_results:
+                st.markdown("---")
+                st.subheader("References needing attention")
+
+        # --- MODIFIED: Results Display Loop ---
+        for i, result in enumerate(detail_results):
+            _render_result(result)
+
+            if i < len(detail_results) - 1:
+                st.markdown("---")
+    else:
+        st.warning("No references found. Please check your input format.")
+
 def main():
     st.set_page_config(
         page_title="Academic Reference Verifier",
@@ -1114,19 +1857,8 @@ World Health Organization. (2021). COVID-19 pandemic. Retrieved March 15, 2023,
         
         with col_b:
             if st.button("📝 Load Sample Data", use_container_width=True):
-                sample_data = """American College of Sports Medicine. (2022). ACSM’s guidelines for exercise testing and prescription (11th ed.). Wolters Kluwer.
-American Heart Association. (2024). Understanding blood pressure readings. American Heart Association. https://www.heart.org/en/health-topics/high-blood-pressure/understanding-blood-pressure-readings
-Australian Government Department of Health and Aged Care. (2021, July 29). Body Mass Index (BMI) and Waist Measurement. Department of Health and Aged Care. https://www.health.gov.au/topics/overweight-and-obesity/bmi-and-waist
-Coombes, J., & Skinner, T. (2014). ESSA’s student manual for health, exercise and sport assessment. Elsevier.
-Health Direct. (2019). Resting heart rate. Healthdirect.gov.au; Healthdirect Australia. https://www.healthdirect.gov.au/resting-heart-rate
-Kumar, K. (2022, January 12). What Is a Good Resting Heart Rate by Age? MedicineNet. https://www.medicinenet.com/what_is_a_good_resting_heart_rate_by_age/article.htm
-Haff, G. G., & Triplett, N. T. (2016). Essentials of strength training and conditioning (4th ed.). Human Kinetics.
-Powden, C. J., Hoch, J. M., & Hoch, M. C. (2015b). Reliability and Minimal Detectable Change of the weight-bearing Lunge test: a Systematic Review. Manual Therapy, 20(4), 524–532. https://doi.org/10.1016/j.math.2015.01.004
-Ryan, C., Uthoff, A., McKenzie, C., & Cronin, J. (2022). Traditional and modified 5-0-5 change of direction test: Normative and reliability analysis. Strength & Conditioning Journal, 44(4), 22–37. https://doi.org/10.1519/SSC.0000000000000635
-Shrestha, M. (2022). Sit and Reach Test. Physiopedia. https://www.physio-pedia.com/Sit_and_Reach_Test
-Watson, S., & Nall, R. (2023, February 2). What Is the Waist-to-Hip Ratio? Healthline; Healthline Media. https://www.healthline.com/health/waist-to-hip-ratio
-Wood, R. (2008). Push Up Test: Home fitness tests. Topendsports.com. https://www.topendsports.com/testing/tests/home-pushup.htm"""
-                st.session_state.sample_text = sample_data
+                reference_text = SAMPLE_REFERENCES
+                verify_button = True
         
         with st.expander("💡 Quick Tips"):
             st.markdown("""
@@ -1140,11 +1872,6 @@ Wood, R. (2008). Push Up Test: Home fitness tests. Topendsports.com. https://www
     with col2:
         st.header("📊 Verification Results")
         
-        if 'sample_text' in st.session_state:
-            reference_text = st.session_state.sample_text
-            del st.session_state.sample_text
-            verify_button = True
-        
         if verify_button and reference_text.strip():
             progress_bar = st.progress(0)
             status_text = st.empty()
@@ -1154,130 +1881,32 @@ Wood, R. (2008). Push Up Test: Home fitness tests. Topendsports.com. https://www
                 progress_bar.progress(progress)
                 status_text.text(f"{message} ({current}/{total})")
             
+            # Show each card as soon as its reference is checked; the full summary replaces
+            # these once the whole list is done. Lines verified recently come from the
+            # verifier's result cache, so repeating a list costs no lookups.
+            live_results = st.empty()
+            live_box = live_results.container()
+            
+            def show_result(result):
+                with live_box:
+                    _render_result(result)
+            
             with st.spinner("Analyzing references..."):
-                verifier = ReferenceVerifier()
-                results = verifier.verify_references(reference_text, format_type, update_progress)
+                verifier = get_verifier()
+                results = verifier.verify_references(reference_text, format_type, update_progress, show_result)
+            live_results.empty()
             
             progress_bar.empty()
             status_text.empty()
             
-            if results:
-                total_refs = len(results)
-                valid_refs = sum(1 for r in results if r['overall_status'] == 'valid')
-                potential_issues = sum(1 for r in results if r['overall_status'] in ['structure_error', 'content_error'])
-                likely_fake = sum(1 for r in results if r['overall_status'] == 'likely_fake')
-                
-                # --- MODIFIED: Summary Metrics ---
-                col_a, col_b, col_c, col_d = st.columns(4)
-                with col_a:
-                    st.metric("Total References", total_refs)
-                with col_b:
-                    st.metric("✅ Valid", valid_refs)
-                with col_c:
-                    st.metric("🟡 Potential Issues", potential_issues)
-                with col_d:
-                    st.metric("🔴 Likely Fake", likely_fake)
-                
-                st.markdown("---")
-                
-                # --- MODIFIED: Results Display Loop ---
-                for i, result in enumerate(results):
-                    ref_text = result['reference']
-                    status = result['overall_status']
-                    
-                    type_icons = {'journal': '📄', 'book': '📚', 'website': '🌐'}
-                    type_icon = type_icons.get(result.get('reference_type', 'journal'), '📄')
-                    
-                    # --- GREEN LIGHT ---
-                    if status == 'valid':
-                        with st.container():
-                            st.success(f"✅ **Reference {result['line_number']}**: Verified and Valid")
-                            st.write(f"_{type_icon} {result.get('reference_type', 'N/A').title()}_")
-                            st.write(ref_text)
-                            
-                            existence = result['existence_check']
-                            verification_sources = existence.get('verification_sources', [])
-                            
-                            if verification_sources:
-                                st.write("**Verified via:**")
-                                for source in verification_sources:
-                                    st.markdown(f"• **{source['type']}**: [{source['description']}]({source['url']})")
-                    
-                    # --- YELLOW LIGHT ---
-                    elif status in ['structure_error', 'content_error']:
-                        with st.container():
-                            st.warning(f"🟡 **Reference {result['line_number']}**: Potential Formatting or Content Issue")
-                            st.write(f"_{type_icon} {result.get('reference_type', 'N/A').title()}_")
-                            st.write(ref_text)
-                            
-                            if status == 'structure_error':
-                                issues = result['structure_check'].get('structure_issues', [])
-                                st.write("**Reason:** The reference has formatting problems.")
-                                for issue in issues:
-                                    st.write(f"• {issue}")
-                            elif status == 'content_error':
-                                st.write("**Reason:** Could not reliably extract key information (like title or authors) to perform an existence check.")
-
-                    # --- RED LIGHT ---
-                    elif status == 'likely_fake':
-                        with st.container():
-                            st.error(f"🔴 **Reference {result['line_number']}**: Likely Fake or Erroneous")
-                            st.write(f"_{type_icon} {result.get('reference_type', 'N/A').title()}_")
-                            st.write(ref_text)
-                            
-                            existence = result['existence_check']
-                            search_details = existence.get('search_details', {})
-                            
-                            st.write(f"**Reason:** While the format may be correct, this reference could not be found in any academic or public databases.")
-                            st.write("**Verification Attempts:**")
-
-                            current_ref_type = result.get('reference_type', 'journal')
-                            if current_ref_type == 'journal':
-                                if 'doi' in search_details and not search_details['doi'].get('valid'):
-                                    st.write(f"• **DOI Check**: {search_details['doi'].get('reason')}")
-                                if 'comprehensive_journal' in search_details and not search_details['comprehensive_journal'].get('found'):
-                                    st.write(f"• **Database Search**: {search_details['comprehensive_journal'].get('reason')}")
-
-                            elif current_ref_type == 'book':
-                                if 'isbn_search' in search_details and not search_details['isbn_search'].get('found'):
-                                    st.write(f"• **ISBN Check**: {search_details['isbn_search'].get('reason')}")
-                                if 'comprehensive_book_openlibrary' in search_details and not search_details['comprehensive_book_openlibrary'].get('found'):
-                                    st.write(f"• **Open Library Search**: {search_details['comprehensive_book_openlibrary'].get('reason')}")
-                                if 'comprehensive_book_googlebooks' in search_details and not search_details['comprehensive_book_googlebooks'].get('found'):
-                                    st.write(f"• **Google Books Search**: {search_details['comprehensive_book_googlebooks'].get('reason')}")
-
-                            elif current_ref_type == 'website':
-                                if 'website_check' in search_details and not search_details['website_check'].get('accessible'):
-                                    st.write(f"• **URL Check**: {search_details['website_check'].get('reason')}")
-                    
-                    if i < len(results) - 1:
-                        st.markdown("---")
-            else:
-                st.warning("No references found. Please check your input format.")
+            _render_results(results)
         
         elif verify_button:
             st.warning("Please enter some references to verify.")
     
     # --- MODIFIED: Explainer Text ---
     with st.expander("ℹ️ How the Traffic Light System Works"):
-        st.markdown("""
-        The verifier uses a three-level process to assign a status to each reference:
-        
-        #### ✅ Green: Verified and Valid
-        - **Structure**: Correctly formatted.
-        - **Content**: Key details were extracted successfully.
-        - **Existence**: The reference was found and verified in an external database (e.g., Crossref, Open Library, or a live website).
-        
-        #### 🟡 Yellow: Potential Issues
-        - This status means the reference needs manual review. It can be caused by:
-          - **Formatting Errors**: The reference doesn't follow the selected style (APA/Vancouver) rules, such as missing a year or publisher.
-          - **Content Extraction Failure**: The reference is too malformed to reliably identify its parts (title, authors, etc.), preventing an existence check.
-        
-        #### 🔴 Red: Likely Fake or Erroneous
-        - **Structure**: The reference may look perfectly formatted.
-        - **Content**: Key details were extracted.
-        - **Existence**: **Failed.** The verifier searched all relevant databases (using DOI, ISBN, title, authors, etc.) but could not find any evidence that this publication exists. This indicates the reference may be fabricated or contain critical errors.
-        """)
+        st.markdown(TRAFFIC_LIGHT_EXPLAINER)
 
 if __name__ == "__main__":
     main()